@@ -0,0 +1,610 @@
+# benchmarks/fake_discord.py
+#
+# Offline stand-in for Discord, used by the benchmarks and the load generator.
+#
+# The bot, cogs and discord.py models are all real; only the three places where
+# discord.py talks to the network are replaced:
+#   - HTTPClient.request        (REST: channel history, send/edit/delete message, ...)
+#   - AsyncWebhookAdapter        (interaction responses and followups)
+#   - the gateway websocket      (member queries, incoming events)
+# Everything they would send or receive is served from FakeDiscord, an in-memory
+# server that also counts every call.
+
+import asyncio
+import json
+import os
+import re
+import sys
+import tempfile
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import discord
+from discord.http import HTTPClient, Route
+from discord.webhook.async_ import AsyncWebhookAdapter, async_context
+
+from cogs.carousel import GALLERY_CHANNEL_ID
+from cogs.greetings import GREET_CHANNEL_ID
+from cogs.render_cache import all_caches
+
+# Synthetic ids are snowflakes 1 ms apart starting here, so runs are reproducible
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+MEMORY_CHANNEL_ID = 1407688670550560999
+IMAGE_TYPES = ["image/png", "image/jpeg", "image/gif", "image/webp"]
+
+_MESSAGE_URL = re.compile(r"/messages/(\d+)")
+
+
+class FakeDiscord:
+    """
+    In-memory Discord server.
+
+    Holds users, guilds, channels, messages and members as raw API payloads
+    and answers REST, webhook and gateway requests from them.
+    `latency` adds a fixed delay (seconds) to every REST/webhook call.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self._next_id = 0
+
+        self.users: Dict[int, dict] = {}
+        self.guilds: Dict[int, dict] = {}
+        self.channels: Dict[int, dict] = {}
+        self.messages: Dict[int, Dict[int, dict]] = {}   # channel_id -> {message_id: payload}, oldest first
+        self.members: Dict[int, Dict[int, dict]] = {}    # guild_id -> {user_id: member payload}
+        self.interaction_responses: Dict[int, dict] = {}  # interaction_id -> callback payload
+        self._interaction_channels: Dict[int, int] = {}   # interaction_id -> channel_id
+        self._interaction_messages: Dict[int, str] = {}   # interaction_id -> clicked message id
+
+        self.calls: Counter = Counter()
+        # Called with (interaction_id, callback payload) whenever an interaction is answered
+        self.response_hooks: List[Callable[[int, dict], None]] = []
+        self.bot_user = self.add_user("ZxPMaidBot", bot=True)
+        self.application_id = self.snowflake()
+
+    # ==========
+    # Ids + payloads
+    # ==========
+
+    def snowflake(self) -> int:
+        self._next_id += 1
+        return discord.utils.time_snowflake(EPOCH + timedelta(milliseconds=self._next_id))
+
+    def _timestamp(self, snowflake: int) -> str:
+        return discord.utils.snowflake_time(snowflake).isoformat()
+
+    def add_user(self, name: str, bot: bool = False) -> dict:
+        user_id = self.snowflake()
+        user = {
+            "id": str(user_id),
+            "username": name,
+            "discriminator": "0",
+            "global_name": name,
+            "avatar": None,
+            "bot": bot,
+        }
+        self.users[user_id] = user
+        return user
+
+    def add_guild(self, name: str = "Benchmark Guild", guild_id: int | None = None) -> dict:
+        """Add a guild with the gallery, greetings and memory text channels."""
+        guild_id = guild_id or self.snowflake()
+        guild = {
+            "id": str(guild_id),
+            "name": name,
+            "icon": None,
+            "owner_id": self.bot_user["id"],
+            "features": [],
+            "roles": [
+                {
+                    "id": str(guild_id),
+                    "name": "@everyone",
+                    "permissions": str(discord.Permissions.all().value),
+                    "position": 0,
+                    "color": 0,
+                    "hoist": False,
+                    "managed": False,
+                    "mentionable": False,
+                    "flags": 0,
+                }
+            ],
+            "emojis": [],
+            "stickers": [],
+            "channels": [],
+            "members": [],
+            "member_count": 0,
+        }
+        self.guilds[guild_id] = guild
+        self.members[guild_id] = {}
+        for position, (channel_id, channel_name) in enumerate(
+            [(GALLERY_CHANNEL_ID, "gallery"), (GREET_CHANNEL_ID, "greetings"), (MEMORY_CHANNEL_ID, "memories")]
+        ):
+            self.add_channel(guild_id, channel_name, channel_id=channel_id, position=position)
+        self.add_member(guild_id, self.bot_user)
+        return guild
+
+    def add_channel(self, guild_id: int, name: str, channel_id: int | None = None, position: int = 0) -> dict:
+        channel_id = channel_id or self.snowflake()
+        channel = {
+            "id": str(channel_id),
+            "type": 0,
+            "guild_id": str(guild_id),
+            "name": name,
+            "position": position,
+            "permission_overwrites": [],
+            "nsfw": False,
+            "parent_id": None,
+            "topic": None,
+            "last_message_id": None,
+            "rate_limit_per_user": 0,
+        }
+        self.channels[channel_id] = channel
+        self.messages[channel_id] = {}
+        self.guilds[guild_id]["channels"].append(channel)
+        return channel
+
+    def add_member(self, guild_id: int, user: dict) -> dict:
+        member = {
+            "user": user,
+            "roles": [],
+            "joined_at": self._timestamp(int(user["id"])),
+            "deaf": False,
+            "mute": False,
+            "nick": None,
+            "flags": 0,
+        }
+        self.members[guild_id][int(user["id"])] = member
+        self.guilds[guild_id]["member_count"] += 1
+        return member
+
+    def attachment(self, filename: str, content_type: str | None) -> dict:
+        attachment_id = self.snowflake()
+        url = f"https://cdn.discordapp.com/attachments/0/{attachment_id}/{filename}"
+        return {
+            "id": str(attachment_id),
+            "filename": filename,
+            "size": 1024,
+            "url": url,
+            "proxy_url": url,
+            "content_type": content_type,
+            "width": 800 if content_type else None,
+            "height": 600 if content_type else None,
+        }
+
+    def add_message(self, channel_id: int, author: dict, content: str = "", *,
+                    attachments: List[dict] | None = None, embeds: List[dict] | None = None,
+                    components: List[dict] | None = None) -> dict:
+        message_id = self.snowflake()
+        channel = self.channels[channel_id]
+        message = {
+            "id": str(message_id),
+            "channel_id": str(channel_id),
+            "guild_id": channel["guild_id"],
+            "author": author,
+            "content": content,
+            "timestamp": self._timestamp(message_id),
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": attachments or [],
+            "embeds": embeds or [],
+            "components": components or [],
+            "pinned": False,
+            "type": 0,
+            "flags": 0,
+        }
+        self.messages[channel_id][message_id] = message
+        channel["last_message_id"] = str(message_id)
+        return message
+
+    # ==========
+    # REST
+    # ==========
+
+    async def rest(self, route: Route, params: dict | None = None, payload: dict | None = None) -> Any:
+        self.calls[f"rest {route.key}"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        key = route.key
+        if key == "GET /oauth2/applications/@me":
+            return {
+                "id": str(self.application_id),
+                "name": self.bot_user["username"],
+                "description": "",
+                "icon": None,
+                "bot_public": False,
+                "bot_require_code_grant": False,
+                "owner": self.bot_user,
+                "verify_key": "0" * 64,
+                "flags": 0,
+            }
+        if key == "PUT /applications/{application_id}/commands":
+            return [dict(cmd, id=str(self.snowflake()), application_id=str(self.application_id), version="1")
+                    for cmd in payload or []]
+        if key == "GET /channels/{channel_id}/messages":
+            return self._history(int(route.channel_id), params or {})
+        if key == "POST /channels/{channel_id}/messages":
+            return self._create_message(int(route.channel_id), payload or {})
+        if key == "PATCH /channels/{channel_id}/messages/{message_id}":
+            return self._edit_message(int(route.channel_id), _message_id(route), payload or {})
+        if key == "DELETE /channels/{channel_id}/messages/{message_id}":
+            if self.messages[int(route.channel_id)].pop(_message_id(route), None) is None:
+                raise discord.NotFound(_FakeResponse(404), {"code": 10008, "message": "Unknown Message"})
+            return None
+
+        raise discord.NotFound(_FakeResponse(404), {"code": 0, "message": f"FakeDiscord has no route for {key}"})
+
+    def _history(self, channel_id: int, params: dict) -> List[dict]:
+        limit = int(params.get("limit", 50))
+        before = int(params["before"]) if params.get("before") else None
+        found = []
+        for message_id, message in reversed(self.messages[channel_id].items()):
+            if before is not None and message_id >= before:
+                continue
+            found.append(message)
+            if len(found) >= limit:
+                break
+        return found
+
+    def _create_message(self, channel_id: int, payload: dict) -> dict:
+        return self.add_message(
+            channel_id,
+            self.bot_user,
+            payload.get("content") or "",
+            embeds=payload.get("embeds"),
+            components=payload.get("components"),
+        )
+
+    def _edit_message(self, channel_id: int, message_id: int, payload: dict) -> dict:
+        message = self.messages[channel_id][message_id]
+        for field in ("content", "embeds", "components"):
+            if field in payload:
+                message[field] = payload[field] or ([] if field != "content" else "")
+        message["edited_timestamp"] = datetime.now(timezone.utc).isoformat()
+        return message
+
+    # ==========
+    # Webhooks (interaction responses + followups)
+    # ==========
+
+    async def webhook(self, route: Route, payload: dict | None = None) -> Any:
+        self.calls[f"webhook {route.key}"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        key = route.key
+        if key == "POST /interactions/{webhook_id}/{webhook_token}/callback":
+            return self._interaction_callback(int(route.webhook_id), payload or {})
+        if key == "POST /webhooks/{webhook_id}/{webhook_token}":
+            channel_id = self._interaction_channels[int(route.webhook_token)]
+            return self._create_message(channel_id, payload or {})
+        if key == "PATCH /webhooks/{webhook_id}/{webhook_token}/messages/{message_id}":
+            channel_id = self._interaction_channels[int(route.webhook_token)]
+            return self._edit_message(channel_id, _message_id(route), payload or {})
+        if key == "DELETE /webhooks/{webhook_id}/{webhook_token}/messages/{message_id}":
+            channel_id = self._interaction_channels[int(route.webhook_token)]
+            if self.messages[channel_id].pop(_message_id(route), None) is None:
+                raise discord.NotFound(_FakeResponse(404), {"code": 10008, "message": "Unknown Message"})
+            return None
+
+        raise discord.NotFound(_FakeResponse(404), {"code": 0, "message": f"FakeDiscord has no route for {key}"})
+
+    def _interaction_callback(self, interaction_id: int, payload: dict) -> dict:
+        self.interaction_responses[interaction_id] = payload
+        for hook in self.response_hooks:
+            hook(interaction_id, payload)
+        response_type = payload.get("type")
+        resource: dict = {"type": response_type}
+        data = payload.get("data") or {}
+        ephemeral = bool(data.get("flags", 0) & discord.MessageFlags.ephemeral.flag)
+        channel_id = self._interaction_channels[interaction_id]
+        message_id = None
+
+        if response_type == discord.InteractionResponseType.channel_message.value:
+            if ephemeral:
+                # Only the user sees it; keep it out of the channel history
+                message = dict(self.add_message(channel_id, self.bot_user, data.get("content") or ""))
+                del self.messages[channel_id][int(message["id"])]
+            else:
+                message = self._create_message(channel_id, data)
+            resource["message"] = message
+            message_id = message["id"]
+        elif response_type == discord.InteractionResponseType.message_update.value:
+            message_id = self._interaction_messages.get(interaction_id)
+            if message_id is not None:
+                resource["message"] = self._edit_message(channel_id, int(message_id), data)
+
+        return {
+            "interaction": {
+                "id": str(interaction_id),
+                "type": 3,
+                "response_message_id": message_id,
+                "response_message_loading": False,
+                "response_message_ephemeral": ephemeral,
+            },
+            "resource": resource,
+        }
+
+    # ==========
+    # Gateway payloads
+    # ==========
+
+    def interaction_payload(self, guild_id: int, channel_id: int, user: dict, *, type: int,
+                            data: dict, message: dict | None = None) -> dict:
+        interaction_id = self.snowflake()
+        self._interaction_channels[interaction_id] = channel_id
+        if message is not None:
+            self._interaction_messages[interaction_id] = message["id"]
+        payload = {
+            "id": str(interaction_id),
+            "application_id": str(self.application_id),
+            "type": type,
+            # The token doubles as the key followups use to find the channel
+            "token": str(interaction_id),
+            "version": 1,
+            "guild_id": str(guild_id),
+            "channel": self.channels[channel_id],
+            "channel_id": str(channel_id),
+            "member": dict(self.members[guild_id][int(user["id"])], permissions=str(discord.Permissions.all().value)),
+            "data": data,
+            "app_permissions": str(discord.Permissions.all().value),
+            "attachment_size_limit": 8 * 1024 * 1024,
+            "locale": "en-US",
+            "guild_locale": "en-US",
+            "entitlements": [],
+            "authorizing_integration_owners": {},
+        }
+        if message is not None:
+            payload["message"] = message
+        return payload
+
+    def button_payload(self, guild_id: int, message: dict, user: dict, label: str) -> dict:
+        """INTERACTION_CREATE for pressing the button with this label on a stored message."""
+        custom_id = None
+        for row in message.get("components", []):
+            for component in row.get("components", []):
+                if component.get("label") == label:
+                    custom_id = component["custom_id"]
+        if custom_id is None:
+            raise LookupError(f"No button labelled {label!r} on message {message['id']}")
+        return self.interaction_payload(
+            guild_id, int(message["channel_id"]), user,
+            type=discord.InteractionType.component.value,
+            data={"custom_id": custom_id, "component_type": discord.ComponentType.button.value},
+            message=message,
+        )
+
+    def message_payload(self, channel_id: int, user: dict, content: str) -> dict:
+        """MESSAGE_CREATE for `user` sending `content`."""
+        message = self.add_message(channel_id, user, content)
+        guild_id = int(message["guild_id"])
+        member = dict(self.members[guild_id][int(user["id"])])
+        del member["user"]
+        return dict(message, member=member)
+
+    def latest_message_with(self, channel_id: int, label: str) -> dict | None:
+        """Newest message in the channel that has a button labelled `label`."""
+        for message in reversed(self.messages[channel_id].values()):
+            for row in message.get("components", []):
+                if any(c.get("label") == label for c in row.get("components", [])):
+                    return message
+        return None
+
+    def members_chunk(self, guild_id: int, user_ids: List[int], nonce: str) -> dict:
+        guild_members = self.members.get(guild_id, {})
+        found = [guild_members[uid] for uid in user_ids if uid in guild_members]
+        return {
+            "guild_id": str(guild_id),
+            "members": found,
+            "not_found": [str(uid) for uid in user_ids if uid not in guild_members],
+            "chunk_index": 0,
+            "chunk_count": 1,
+            "nonce": nonce,
+        }
+
+
+def _message_id(route: Route) -> int:
+    match = _MESSAGE_URL.search(route.url)
+    if match is None:
+        raise ValueError(f"No message id in {route.url}")
+    return int(match.group(1))
+
+
+class _FakeResponse:
+    """Just enough of aiohttp.ClientResponse for discord.HTTPException."""
+
+    def __init__(self, status: int):
+        self.status = status
+        self.reason = "Fake"
+
+
+class FakeHTTPClient(HTTPClient):
+    """HTTPClient whose requests are answered by FakeDiscord instead of discord.com."""
+
+    def __init__(self, server: FakeDiscord, loop: asyncio.AbstractEventLoop):
+        super().__init__(loop)
+        self.server = server
+
+    async def static_login(self, token: str) -> dict:
+        self.token = token
+        self._HTTPClient__session = None  # interactions read this, the fake adapter ignores it
+        self._global_over = asyncio.Event()
+        self._global_over.set()
+        return self.server.bot_user
+
+    async def request(self, route: Route, *, files=None, form=None, **kwargs: Any) -> Any:
+        payload = kwargs.get("json")
+        if payload is None and form:
+            payload = json.loads(form[0]["value"])
+        return await self.server.rest(route, params=kwargs.get("params"), payload=payload)
+
+    async def close(self) -> None:
+        pass
+
+
+class FakeWebhookAdapter(AsyncWebhookAdapter):
+    """Webhook adapter used for interaction responses and followups."""
+
+    def __init__(self, server: FakeDiscord):
+        super().__init__()
+        self.server = server
+
+    async def request(self, route: Route, session, *, payload=None, multipart=None, **kwargs: Any) -> Any:
+        if payload is None and multipart:
+            payload = json.loads(multipart[0]["value"])
+        return await self.server.webhook(route, payload=payload)
+
+
+class FakeGateway:
+    """
+    Stand-in for the bot's gateway websocket.
+
+    Member queries are answered with a GUILD_MEMBERS_CHUNK from FakeDiscord and
+    `dispatch` feeds raw gateway events to the same parsers the real
+    websocket uses.
+    """
+
+    open = False
+
+    def __init__(self, server: FakeDiscord, state):
+        self.server = server
+        self.state = state
+        self.shard_id = None
+        self._tasks: set = set()
+
+    @property
+    def latency(self) -> float:
+        return 0.0
+
+    def is_ratelimited(self) -> bool:
+        return False
+
+    async def request_chunks(self, guild_id: int, query=None, *, limit: int, user_ids=None,
+                             presences: bool = False, nonce=None):
+        self.server.calls["gateway REQUEST_GUILD_MEMBERS"] += 1
+        chunk = self.server.members_chunk(guild_id, [int(u) for u in user_ids or []], nonce)
+        task = asyncio.create_task(self._answer_chunk(nonce, chunk))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _answer_chunk(self, nonce: str, chunk: dict):
+        # A real reply arrives after the caller starts waiting for it
+        request = self.state._chunk_requests.get(nonce)
+        while request is not None and not request.waiters:
+            await asyncio.sleep(0)
+        self.dispatch("GUILD_MEMBERS_CHUNK", chunk)
+
+    def dispatch(self, event: str, data: dict):
+        self.server.calls[f"gateway {event}"] += 1
+        self.state.parsers[event](data)
+
+    async def change_presence(self, *, activity=None, status=None, since=0.0):
+        pass
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+@asynccontextmanager
+async def offline_bot(server: FakeDiscord | None = None, *, memories: List[dict] | None = None,
+                      workdir: str | None = None):
+    """
+    Start a real GalleryBot against FakeDiscord and yield (bot, server).
+
+    Runs inside a temporary working directory so data/ and logs/ never touch
+    the real ones; `memories` is written to data/memories.json before the
+    Memory cog loads it.
+    """
+    server = server or FakeDiscord()
+    old_cwd = os.getcwd()
+    tmp = None
+    if workdir is None:
+        tmp = tempfile.TemporaryDirectory(prefix="zxp-bench-")
+        workdir = tmp.name
+    os.chdir(workdir)
+
+    if memories is not None:
+        os.makedirs("data", exist_ok=True)
+        with open(os.path.join("data", "memories.json"), "w", encoding="utf-8") as f:
+            json.dump(memories, f)
+
+    os.environ.setdefault("DISCORD_TOKEN", "offline")
+    import bot as bot_module  # noqa: E402  (needs DISCORD_TOKEN, configures logging)
+
+    adapter_token = async_context.set(FakeWebhookAdapter(server))
+    client = bot_module.GalleryBot()
+    client.http = FakeHTTPClient(server, client.loop)
+    client._connection.http = client.http
+    client.tree._http = client.http
+    client.ws = FakeGateway(server, client._connection)
+    try:
+        await client.login("offline")
+        for guild_payload in server.guilds.values():
+            client._connection._add_guild(discord.Guild(data=guild_payload, state=client._connection))
+        client._ready.set()
+        _reset_render_caches()
+        yield client, server
+    finally:
+        await client.close()
+        _reset_render_caches()
+        async_context.reset(adapter_token)
+        os.chdir(old_cwd)
+        if tmp is not None:
+            tmp.cleanup()
+
+
+def _reset_render_caches():
+    # Every FakeDiscord hands out the same ids, so anything cached by an
+    # earlier bot would look valid to the next one
+    for cache in all_caches().values():
+        cache.clear()
+        cache.reset_stats()
+
+
+def synthetic_memories(server: FakeDiscord, guild_id: int, count: int, authors: List[dict], rng) -> List[dict]:
+    """`count` memories spread over `authors`, oldest first, with stable timestamps."""
+    start = EPOCH
+    return [
+        {
+            "id": i + 1,
+            "guild_id": guild_id,
+            "author_id": int(rng.choice(authors)["id"]),
+            "text": f"Memory {i + 1}: " + " ".join(rng.choice(_WORDS) for _ in range(rng.randint(4, 16))),
+            "message_link": f"https://discord.com/channels/{guild_id}/{MEMORY_CHANNEL_ID}/{i + 1}",
+            "created_at": (start + timedelta(seconds=i)).isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+def fill_gallery(server: FakeDiscord, count: int, rng, image_ratio: float = 0.6, author: dict | None = None):
+    """Post `count` messages to the gallery channel; about `image_ratio` of them carry images."""
+    author = author or server.bot_user
+    for i in range(count):
+        attachments = []
+        if rng.random() < image_ratio:
+            for n in range(rng.randint(1, 3)):
+                attachments.append(server.attachment(f"img_{i}_{n}.png", rng.choice(IMAGE_TYPES)))
+        elif rng.random() < 0.3:
+            attachments.append(server.attachment(f"notes_{i}.txt", "text/plain"))
+        content = "" if rng.random() < 0.3 else f"Photo {i} " + rng.choice(_WORDS)
+        server.add_message(GALLERY_CHANNEL_ID, author, content, attachments=attachments)
+
+
+_WORDS = [
+    "sunset", "coffee", "call", "movie", "walk", "rain", "dinner", "song", "beach", "photo",
+    "laugh", "game", "night", "morning", "trip", "gift", "letter", "hug", "stars", "cake",
+]
+
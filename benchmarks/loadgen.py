@@ -0,0 +1,428 @@
+# benchmarks/loadgen.py
+#
+# Soak test: many synthetic users pressing Memory Panel buttons, opening
+# galleries and sending commands at once, all offline against
+# benchmarks/fake_discord.py.
+#
+#   python -m benchmarks.loadgen --users 300 --rate 100 --duration 60
+#   python -m benchmarks.loadgen --mix list=5,random=5,gallery=1 --record trace.jsonl
+#   python -m benchmarks.loadgen --replay trace.jsonl --speed 2
+#
+# Events go through FakeGateway.dispatch, i.e. the same parsers the real
+# websocket feeds, so views, modals, app commands and prefix commands are
+# dispatched by discord.py itself. Interaction latency is measured up to the
+# interaction response (what Discord's 3 second deadline applies to); prefix
+# command latency up to on_command_completion.
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+logging.basicConfig(level=logging.WARNING)
+
+from benchmarks.fake_discord import (  # noqa: E402
+    MEMORY_CHANNEL_ID,
+    FakeDiscord,
+    fill_gallery,
+    offline_bot,
+    synthetic_memories,
+)
+from benchmarks.run import RESULTS_DIR, git_commit, percentile  # noqa: E402
+
+import discord  # noqa: E402
+
+from cogs.render_cache import all_caches  # noqa: E402
+
+DEFAULT_MIX = {
+    "list": 25,      # press 📃List on the current Memory Panel
+    "random": 25,    # press 🎲Random on the current Memory Panel
+    "add": 10,       # press Add, then submit the modal
+    "gallery": 5,    # /gallery
+    "next": 15,      # press Next on the newest gallery
+    "command": 10,   # !listmemory / !randommemory
+    "chat": 10,      # plain message, goes through on_message without a command
+}
+
+COMMANDS = ["!listmemory", "!randommemory", "!listmemory 10"]
+GALLERY_HISTORY = 300
+START_MEMORIES = 1000
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown event kind {kind!r}, expected one of {', '.join(DEFAULT_MIX)}")
+        mix[kind] = int(weight or 1)
+    return mix
+
+
+def generate_trace(rng: random.Random, mix: Dict[str, int], users: int, rate: float, duration: float) -> List[dict]:
+    """Poisson arrivals at `rate` events/s for `duration` seconds."""
+    kinds = list(mix)
+    weights = [mix[k] for k in kinds]
+    trace = []
+    t = 0.0
+    while True:
+        t += rng.expovariate(rate)
+        if t >= duration:
+            break
+        kind = rng.choices(kinds, weights)[0]
+        event = {"t": round(t, 6), "kind": kind, "user": rng.randrange(users)}
+        if kind == "command":
+            event["content"] = rng.choice(COMMANDS)
+        elif kind == "chat":
+            event["content"] = f"hello from user {event['user']}"
+        elif kind == "add":
+            event["content"] = f"soak memory {len(trace)}"
+        trace.append(event)
+    return trace
+
+
+def rss_mb() -> float:
+    """Current resident set size; falls back to the peak where /proc is missing."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+class LoadGenerator:
+    def __init__(self, bot, server: FakeDiscord, guild_id: int, users: List[dict], lounge_id: int):
+        self.bot = bot
+        self.server = server
+        self.gateway = bot.ws
+        self.guild_id = guild_id
+        self.users = users
+        self.lounge_id = lounge_id
+
+        self.sent: Dict[int, tuple] = {}         # interaction/message id -> (kind, perf_counter at dispatch)
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.dispatched: Counter = Counter()
+        self.skipped: Counter = Counter()
+        self.errors: Counter = Counter()
+        self._modal_waiters: Dict[int, asyncio.Future] = {}
+        self._tasks: set = set()
+
+        server.response_hooks.append(self._on_response)
+        bot.add_listener(self._on_command_completion, "on_command_completion")
+        bot.add_listener(self._on_command_error, "on_command_error")
+        bot.tree.on_error = self._on_app_command_error
+
+    # ==========
+    # Completion tracking
+    # ==========
+
+    def _done(self, key: int):
+        sent = self.sent.pop(key, None)
+        if sent is not None:
+            kind, started = sent
+            self.latencies[kind].append(time.perf_counter() - started)
+
+    def _on_response(self, interaction_id: int, payload: dict):
+        self._done(interaction_id)
+        waiter = self._modal_waiters.pop(interaction_id, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(payload)
+
+    async def _on_command_completion(self, ctx):
+        self._done(ctx.message.id)
+
+    async def _on_command_error(self, ctx, error):
+        self.errors[f"command {type(error).__name__}"] += 1
+        self.sent.pop(ctx.message.id, None)
+
+    async def _on_app_command_error(self, interaction, error):
+        self.errors[f"app_command {type(error).__name__}"] += 1
+
+    # ==========
+    # Events
+    # ==========
+
+    def _dispatch(self, event: str, payload: dict, kind: str | None = None):
+        if kind is not None:
+            self.sent[int(payload["id"])] = (kind, time.perf_counter())
+            self.dispatched[kind] += 1
+        self.gateway.dispatch(event, payload)
+
+    def _press(self, kind: str, channel_id: int, user: dict, label: str) -> int | None:
+        message = self.server.latest_message_with(channel_id, label)
+        if message is None:
+            self.skipped[kind] += 1
+            return None
+        payload = self.server.button_payload(self.guild_id, message, user, label)
+        self._dispatch("INTERACTION_CREATE", payload, kind)
+        return int(payload["id"])
+
+    def fire(self, event: dict):
+        user = self.users[event["user"] % len(self.users)]
+        kind = event["kind"]
+
+        if kind == "list":
+            self._press(kind, MEMORY_CHANNEL_ID, user, "📃List")
+        elif kind == "random":
+            self._press(kind, MEMORY_CHANNEL_ID, user, "🎲Random")
+        elif kind == "next":
+            self._press(kind, self.lounge_id, user, "Next")
+        elif kind == "add":
+            self._spawn(self._add(user, event.get("content") or "soak memory"))
+        elif kind == "gallery":
+            command = self.bot.tree.get_command("gallery")
+            payload = self.server.interaction_payload(
+                self.guild_id, self.lounge_id, user,
+                type=discord.InteractionType.application_command.value,
+                data={"id": str(self.server.snowflake()), "name": command.name, "type": 1},
+            )
+            self._dispatch("INTERACTION_CREATE", payload, kind)
+        else:  # command / chat
+            payload = self.server.message_payload(MEMORY_CHANNEL_ID, user, event["content"])
+            # Plain chat never completes a command, so only commands are timed
+            self._dispatch("MESSAGE_CREATE", payload, kind if kind == "command" else None)
+            if kind == "chat":
+                self.dispatched[kind] += 1
+
+    async def _add(self, user: dict, text: str):
+        """Press Add, wait for the modal, then submit it like the user typed `text`."""
+        waiter = asyncio.get_running_loop().create_future()
+        interaction_id = self._press("add_open", MEMORY_CHANNEL_ID, user, "Add")
+        if interaction_id is None:
+            return
+        self._modal_waiters[interaction_id] = waiter
+        if interaction_id in self.server.interaction_responses:
+            waiter.set_result(self.server.interaction_responses[interaction_id])
+
+        try:
+            response = await asyncio.wait_for(waiter, timeout=10)
+        except asyncio.TimeoutError:
+            self.errors["add modal never opened"] += 1
+            return
+
+        modal = response["data"]
+        components = json.loads(json.dumps(modal["components"]))
+        for row in components:
+            for component in row.get("components", []) or [row.get("component", {})]:
+                if component.get("type") == discord.ComponentType.text_input.value:
+                    component["value"] = text
+
+        message = self.server.latest_message_with(MEMORY_CHANNEL_ID, "Add")
+        payload = self.server.interaction_payload(
+            self.guild_id, MEMORY_CHANNEL_ID, user,
+            type=discord.InteractionType.modal_submit.value,
+            data={"custom_id": modal["custom_id"], "components": components},
+            message=message,
+        )
+        self._dispatch("INTERACTION_CREATE", payload, "add")
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # ==========
+    # Running
+    # ==========
+
+    def snapshot(self, started: float) -> dict:
+        state = self.bot._connection
+        snap = {
+            "t": round(time.perf_counter() - started, 3),
+            "rss_mb": round(rss_mb(), 2),
+            "in_flight": len(self.sent),
+            "views": len(state._view_store._synced_message_views),
+            "modals": len(state._view_store._modals),
+            "memories": len(self.bot.get_cog("Memory").memories),
+            "server_messages": sum(len(m) for m in self.server.messages.values()),
+            "render_cache_entries": sum(len(c) for c in all_caches().values()),
+        }
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            snap["traced_mb"] = round(current / 2**20, 2)
+            snap["traced_peak_mb"] = round(peak / 2**20, 2)
+        return snap
+
+    async def run(self, trace: List[dict], speed: float, sample_every: float, drain: float) -> List[dict]:
+        samples = []
+        started = time.perf_counter()
+        next_sample = 0.0
+
+        for event in trace:
+            due = event["t"] / speed
+            while True:
+                now = time.perf_counter() - started
+                if now >= next_sample:
+                    samples.append(self.snapshot(started))
+                    next_sample += sample_every
+                wait = min(due, next_sample) - now
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+                if time.perf_counter() - started >= due:
+                    break
+            self.fire(event)
+
+        # Let in-flight events finish before the final sample
+        deadline = time.perf_counter() + drain
+        while (self.sent or self._tasks) and time.perf_counter() < deadline:
+            await asyncio.sleep(0.01)
+        gc.collect()
+        samples.append(self.snapshot(started))
+        return samples
+
+
+def latency_summary(samples: List[float]) -> dict:
+    ordered = sorted(samples)
+    ms = lambda s: round(s * 1000, 3)  # noqa: E731
+    return {
+        "count": len(ordered),
+        "p50_ms": ms(percentile(ordered, 50)),
+        "p90_ms": ms(percentile(ordered, 90)),
+        "p99_ms": ms(percentile(ordered, 99)),
+        "max_ms": ms(ordered[-1]) if ordered else 0.0,
+    }
+
+
+async def soak(args, trace: List[dict]) -> dict:
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+
+    server = FakeDiscord(latency=args.latency)
+    guild_id = int(server.add_guild()["id"])
+    lounge_id = int(server.add_channel(guild_id, "lounge", position=3)["id"])
+    user_count = max(args.users, max((e["user"] for e in trace), default=0) + 1)
+    users = [server.add_user(f"user{i}") for i in range(user_count)]
+    for user in users:
+        server.add_member(guild_id, user)
+    fill_gallery(server, GALLERY_HISTORY, rng)
+    memories = synthetic_memories(server, guild_id, args.memories, users, rng)
+
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    async with offline_bot(server, memories=memories) as (bot, server):
+        generator = LoadGenerator(bot, server, guild_id, users, lounge_id)
+
+        # Open the first Memory Panel the way a user would
+        generator.fire({"kind": "command", "user": 0, "content": "!memorypanel"})
+        await asyncio.sleep(0.05)
+        baseline_calls = Counter(server.calls)
+
+        print(f"Replaying {len(trace)} events from {user_count} users over {trace[-1]['t'] if trace else 0:.1f}s")
+        samples = await generator.run(trace, args.speed, args.sample_every, args.drain)
+        calls = server.calls - baseline_calls
+        unanswered = Counter(kind for kind, _ in generator.sent.values())
+
+        # Whatever is still running (carousel loops, events that missed the
+        # drain) would otherwise hit the bot after it is closed
+        pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    if args.tracemalloc:
+        tracemalloc.stop()
+
+    all_latencies = [s for values in generator.latencies.values() for s in values]
+    rest_calls = sum(v for k, v in calls.items() if not k.startswith("gateway"))
+    return {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "discord_py": discord.__version__,
+        "config": {
+            "seed": args.seed,
+            "users": user_count,
+            "rate": args.rate,
+            "duration": args.duration,
+            "speed": args.speed,
+            "mix": args.mix,
+            "memories": args.memories,
+            "latency_s": args.latency,
+            "replay": args.replay,
+            "events": len(trace),
+        },
+        "dispatched": dict(generator.dispatched),
+        "skipped": dict(generator.skipped),
+        "unanswered": dict(unanswered),
+        "errors": dict(generator.errors),
+        "latency": {
+            "all": latency_summary(all_latencies),
+            **{kind: latency_summary(values) for kind, values in sorted(generator.latencies.items())},
+        },
+        "calls": {
+            "rest_and_webhook_total": rest_calls,
+            "per_event": round(rest_calls / len(trace), 3) if trace else 0.0,
+            "by_route": dict(sorted(calls.items())),
+        },
+        "memory": {
+            "rss_start_mb": samples[0]["rss_mb"] if samples else None,
+            "rss_end_mb": samples[-1]["rss_mb"] if samples else None,
+            "rss_growth_mb": round(samples[-1]["rss_mb"] - samples[0]["rss_mb"], 2) if samples else None,
+            "samples": samples,
+        },
+        "render_caches": {name: cache.stats() for name, cache in all_caches().items()},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline soak test for ZxPMaidBot")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=50.0, help="events per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of generated load")
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX),
+                        help="event weights, e.g. list=5,random=5,gallery=1")
+    parser.add_argument("--memories", type=int, default=START_MEMORIES, help="memories stored before the run")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated REST round trip in seconds")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--record", help="write the event trace (JSON lines) here")
+    parser.add_argument("--replay", help="replay a recorded trace instead of generating one")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier")
+    parser.add_argument("--sample-every", type=float, default=1.0, help="seconds between memory samples")
+    parser.add_argument("--drain", type=float, default=5.0, help="seconds to wait for in-flight events")
+    parser.add_argument("--tracemalloc", action="store_true", help="also track Python heap usage (several times slower, latencies are not comparable)")
+    parser.add_argument("--output", help="report path (default: benchmarks/results/soak-<commit>.json)")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        with open(args.replay, encoding="utf-8") as f:
+            trace = [json.loads(line) for line in f if line.strip()]
+    else:
+        trace = generate_trace(random.Random(args.seed), args.mix, args.users, args.rate, args.duration)
+
+    if args.record:
+        with open(args.record, "w", encoding="utf-8") as f:
+            for event in trace:
+                f.write(json.dumps(event) + "\n")
+
+    report = asyncio.run(soak(args, trace))
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"soak-{report['commit'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    overall = report["latency"]["all"]
+    print(
+        f"{overall['count']} answered, p50 {overall['p50_ms']} ms, p99 {overall['p99_ms']} ms, "
+        f"{report['calls']['rest_and_webhook_total']} REST/webhook calls, "
+        f"RSS {report['memory']['rss_growth_mb']:+} MB"
+    )
+    print(f"Report written to {os.path.relpath(output)}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,382 @@
+# benchmarks/run.py
+#
+# Offline benchmarks for the cog hot paths, run against benchmarks/fake_discord.py.
+#
+#   python -m benchmarks.run                        # full suite, JSON report in benchmarks/results/
+#   python -m benchmarks.run --quick                # small sizes only (10^3, 10^4 memories)
+#   python -m benchmarks.run --only memory gallery  # some groups only
+#   python -m benchmarks.run --compare old.json new.json
+#
+# Inputs are seeded, so two runs on the same commit measure the same work;
+# compare reports from different commits to see what changed.
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+# Keep discord.py / bot.py quiet and stop bot.py from writing a log file
+logging.basicConfig(level=logging.WARNING)
+
+from benchmarks.fake_discord import (  # noqa: E402
+    GALLERY_CHANNEL_ID,
+    MEMORY_CHANNEL_ID,
+    REPO_ROOT,
+    FakeDiscord,
+    fill_gallery,
+    offline_bot,
+    synthetic_memories,
+)
+
+import discord  # noqa: E402
+
+from cogs.carousel import CarouselView  # noqa: E402
+from cogs.memory import MemoryPanelView  # noqa: E402
+from cogs.render_cache import all_caches  # noqa: E402
+
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+FULL_SIZES = [10**3, 10**4, 10**5, 10**6]
+QUICK_SIZES = [10**3, 10**4]
+# Carousel._load_gallery_images reads history(limit=100), so deeper
+# histories do the same work; add sizes here once that limit is raised
+GALLERY_HISTORIES = [100]
+AUTHORS = 50
+WARMUP = 3
+
+
+# ==========
+# Measuring
+# ==========
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    if not samples:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(samples)))
+    return samples[min(rank, len(samples)) - 1]
+
+
+def summarize(name: str, params: dict, samples: List[float], calls: Counter) -> dict:
+    ordered = sorted(samples)
+    total = sum(samples)
+    ms = lambda s: round(s * 1000, 4)  # noqa: E731
+    return {
+        "name": name,
+        "params": params,
+        "iterations": len(samples),
+        "total_s": round(total, 6),
+        "ops_per_s": round(len(samples) / total, 2) if total else None,
+        "latency_ms": {
+            "mean": ms(total / len(samples)) if samples else 0.0,
+            "p50": ms(percentile(ordered, 50)),
+            "p90": ms(percentile(ordered, 90)),
+            "p99": ms(percentile(ordered, 99)),
+            "max": ms(ordered[-1]) if ordered else 0.0,
+        },
+        "calls_per_op": {k: round(v / len(samples), 3) for k, v in sorted(calls.items())} if samples else {},
+        "render_caches": {name: cache.stats() for name, cache in all_caches().items()},
+    }
+
+
+async def measure(name: str, params: dict, server: FakeDiscord, iterations: int,
+                  op: Callable[[int], Awaitable], setup: Callable[[int], Awaitable] | None = None) -> dict:
+    """
+    Time `op(i)` for each iteration after a short warmup.
+    `setup(i)` runs before each op but is neither timed nor counted.
+    """
+    for i in range(WARMUP):
+        if setup:
+            await setup(-1 - i)
+        await op(-1 - i)
+
+    for cache in all_caches().values():
+        cache.reset_stats()
+
+    samples: List[float] = []
+    calls: Counter = Counter()
+    for i in range(iterations):
+        if setup:
+            await setup(i)
+        before = Counter(server.calls)
+        start = time.perf_counter()
+        await op(i)
+        samples.append(time.perf_counter() - start)
+        calls.update(server.calls - before)
+
+    result = summarize(name, params, samples, calls)
+    print(
+        f"  {name:<18} {json.dumps(params):<28} "
+        f"p50 {result['latency_ms']['p50']:>9.3f} ms  p99 {result['latency_ms']['p99']:>9.3f} ms  "
+        f"{result['ops_per_s'] or 0:>10.1f} ops/s"
+    )
+    return result
+
+
+# ==========
+# Fixtures
+# ==========
+
+def new_server(rng: random.Random, authors: int = AUTHORS):
+    server = FakeDiscord()
+    guild_id = int(server.add_guild()["id"])
+    users = [server.add_user(f"user{i}") for i in range(authors)]
+    for user in users:
+        server.add_member(guild_id, user)
+    return server, guild_id, users
+
+
+def command_message(bot, server: FakeDiscord, channel_id: int, user: dict, content: str) -> discord.Message:
+    """A real discord.Message for `content`, as if the user had just sent it."""
+    payload = server.add_message(channel_id, user, content)
+    payload["member"] = server.members[int(payload["guild_id"])][int(user["id"])]
+    channel = bot.get_channel(channel_id)
+    return discord.Message(state=bot._connection, channel=channel, data=payload)
+
+
+async def invoke(bot, message: discord.Message):
+    ctx = await bot.get_context(message)
+    await bot.invoke(ctx)
+
+
+async def new_panel(bot, server: FakeDiscord, guild_id: int) -> tuple[MemoryPanelView, dict]:
+    """Post a fresh Memory Panel and return its view and raw message payload."""
+    cog = bot.get_cog("Memory")
+    view = MemoryPanelView(cog)
+    channel = bot.get_channel(MEMORY_CHANNEL_ID)
+    view.message = await channel.send(embed=discord.Embed(title="💞 Memory Panel"), view=view)
+    return view, server.messages[MEMORY_CHANNEL_ID][view.message.id]
+
+
+def interaction_for(bot, payload: dict) -> discord.Interaction:
+    return discord.Interaction(data=payload, state=bot._connection)
+
+
+# ==========
+# Benchmarks
+# ==========
+
+async def bench_gallery(seed: int, iterations: int) -> List[dict]:
+    results = []
+    for history in GALLERY_HISTORIES:
+        rng = random.Random(seed)
+        server, guild_id, users = new_server(rng)
+        fill_gallery(server, history, rng)
+
+        async with offline_bot(server) as (bot, server):
+            cog = bot.get_cog("Carousel")
+            guild = bot.get_guild(guild_id)
+
+            async def load(i):
+                await cog._load_gallery_images(guild)
+
+            results.append(await measure("gallery_load", {"history": history}, server, iterations, load))
+
+            images = await cog._load_gallery_images(guild)
+            view = CarouselView(images=images, auto_loop=False)
+            channel = bot.get_channel(GALLERY_CHANNEL_ID)
+            view.message = await channel.send(embed=view.build_embed(), view=view)
+
+            async def tick(i):
+                # One iteration of CarouselView._auto_advance
+                view.index = (view.index + 1) % len(view.images)
+                await view.message.edit(embed=view.build_embed(), view=view)
+
+            results.append(await measure(
+                "carousel_tick", {"history": history, "images": len(images)}, server, iterations, tick
+            ))
+            view.stop()
+    return results
+
+
+async def bench_memory(seed: int, iterations: int, sizes: List[int]) -> List[dict]:
+    results = []
+    for size in sizes:
+        rng = random.Random(seed)
+        random.seed(seed)  # the cog picks random memories with the module RNG
+        server, guild_id, users = new_server(rng)
+        memories = synthetic_memories(server, guild_id, size, users, rng)
+
+        async with offline_bot(server, memories=memories) as (bot, server):
+            user = users[0]
+            params = {"memories": size}
+
+            # Every add rewrites the whole JSON file, so scale it down with size
+            add_iterations = max(3, min(iterations, 10**5 // size))
+            messages: Dict[int, discord.Message] = {}
+
+            async def prepare_add(i):
+                messages[i] = command_message(
+                    bot, server, MEMORY_CHANNEL_ID, user, f"!addmemory benchmark memory {i}"
+                )
+
+            async def add(i):
+                await invoke(bot, messages.pop(i))
+
+            results.append(await measure("memory_add", params, server, add_iterations, add, prepare_add))
+
+            cog = bot.get_cog("Memory")
+            # memory_list is served from the render cache after warmup;
+            # memory_list_cold drops it first, so it pays for the guild scan
+            # and sort that follow every add
+            for label, name, cold in (
+                ("📃List", "memory_list", False),
+                ("📃List", "memory_list_cold", True),
+                ("🎲Random", "memory_random", False),
+            ):
+                pressed: Dict[int, tuple] = {}
+
+                async def prepare_press(i, label=label, cold=cold, pressed=pressed):
+                    if cold:
+                        cog._invalidate_renders({"guild_id": guild_id})
+                    view, message = await new_panel(bot, server, guild_id)
+                    payload = server.button_payload(guild_id, message, user, label)
+                    pressed[i] = (view, interaction_for(bot, payload))
+
+                async def press(i, label=label, pressed=pressed):
+                    view, interaction = pressed.pop(i)
+                    button = view.list_button if label == "📃List" else view.random_button
+                    await button.callback(interaction)
+
+                results.append(await measure(name, params, server, iterations, press, prepare_press))
+
+            respawns: Dict[int, tuple] = {}
+
+            async def prepare_respawn(i):
+                view, message = await new_panel(bot, server, guild_id)
+                payload = server.button_payload(guild_id, message, user, "📃List")
+                respawns[i] = (view, interaction_for(bot, payload))
+
+            async def respawn(i):
+                view, interaction = respawns.pop(i)
+                await view._respawn_panel(interaction)
+
+            results.append(await measure("panel_respawn", params, server, iterations, respawn, prepare_respawn))
+    return results
+
+
+async def bench_scheduler(seed: int, iterations: int) -> List[dict]:
+    random.seed(seed)
+    rng = random.Random(seed)
+    server, guild_id, users = new_server(rng)
+    results = []
+
+    async with offline_bot(server) as (bot, server):
+        cog = bot.get_cog("Greetings")
+        for name, task in (("greeting_morning", cog.morning_task), ("greeting_night", cog.night_task)):
+            async def fire(i, task=task):
+                # What tasks.loop runs when the scheduled time comes
+                await task()
+
+            results.append(await measure(name, {}, server, iterations, fire))
+    return results
+
+
+GROUPS = {
+    "gallery": lambda args: bench_gallery(args.seed, args.iterations),
+    "memory": lambda args: bench_memory(args.seed, args.iterations, args.sizes),
+    "scheduler": lambda args: bench_scheduler(args.seed, args.iterations),
+}
+
+
+# ==========
+# Reports
+# ==========
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old_path: str, new_path: str):
+    """Print p50/p99 and throughput changes between two reports."""
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+
+    key = lambda r: (r["name"], json.dumps(r["params"], sort_keys=True))  # noqa: E731
+    old_results = {key(r): r for r in old["results"]}
+
+    print(f"{old.get('commit')} -> {new.get('commit')}")
+    for result in new["results"]:
+        before = old_results.get(key(result))
+        if before is None:
+            print(f"  {result['name']:<18} {json.dumps(result['params']):<28} (new)")
+            continue
+
+        def change(a, b):
+            return f"{(b - a) / a * 100:+7.1f}%" if a else "    n/a"
+
+        print(
+            f"  {result['name']:<18} {json.dumps(result['params']):<28} "
+            f"p50 {change(before['latency_ms']['p50'], result['latency_ms']['p50'])}  "
+            f"p99 {change(before['latency_ms']['p99'], result['latency_ms']['p99'])}  "
+            f"ops/s {change(before['ops_per_s'] or 0, result['ops_per_s'] or 0)}"
+        )
+
+
+async def run(args) -> dict:
+    results = []
+    for group in args.only:
+        print(f"[{group}]")
+        results.extend(await GROUPS[group](args))
+
+    return {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "discord_py": discord.__version__,
+        "platform": platform.platform(),
+        "config": {
+            "seed": args.seed,
+            "iterations": args.iterations,
+            "sizes": args.sizes,
+            "groups": args.only,
+        },
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks for ZxPMaidBot cogs")
+    parser.add_argument("--only", nargs="+", choices=sorted(GROUPS), default=list(GROUPS))
+    parser.add_argument("--quick", action="store_true", help="only 10^3 and 10^4 memories")
+    parser.add_argument("--sizes", type=int, nargs="+", help="memory counts to benchmark")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", help="report path (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two reports and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    args.sizes = args.sizes or (QUICK_SIZES if args.quick else FULL_SIZES)
+    report = asyncio.run(run(args))
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{report['commit'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {os.path.relpath(output)}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,9 +6,16 @@ from discord.ext import commands
 import asyncio
 from typing import List, Tuple
 
+from cogs.render_cache import RenderCache, register
+
 # Replace with your actual gallery channel ID (int)
 GALLERY_CHANNEL_ID = 1407688670550560902  # <-- SET THIS
 
+# Rendered slides, shared by every open gallery. Keys are the slide content
+# itself, so entries stay valid across cog reloads.
+SLIDE_CACHE_SIZE = 256
+slide_cache = register(RenderCache("gallery", max_size=SLIDE_CACHE_SIZE))
+
 
 class CarouselView(discord.ui.View):
     def __init__(self, images: List[Tuple[str, str]], start_index: int = 0, auto_loop: bool = True, loop_delay: int = 10):
@@ -28,12 +35,22 @@ class CarouselView(discord.ui.View):
 
     def build_embed(self) -> discord.Embed:
         url, text = self.images[self.index]
+
+        # Keyed by the slide itself and its position, so galleries loaded
+        # from the same channel share entries and a changed gallery never
+        # hits a stale one
+        key = (len(self.images), self.index, url, text)
+        embed = slide_cache.get(key)
+        if embed is not None:
+            return embed
+
         embed = discord.Embed(
             title=f"Gallery ({self.index + 1}/{len(self.images)})",
             description=text or " ",
             color=0x00bfff,
         )
         embed.set_image(url=url)
+        slide_cache.put(key, embed)
         return embed
 
     async def start(self, interaction: discord.Interaction):
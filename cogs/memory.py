@@ -1,26 +1,173 @@
 # cogs/memory.py
 
+import asyncio
 import json
 import os
 import random
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
 
 import discord
 from discord.ext import commands
 
+from cogs.render_cache import RenderCache, all_caches, register, unregister
+
 DATA_DIR = "data"
 MEMORY_FILE = os.path.join(DATA_DIR, "memories.json")
 
+# Author lookup cache (see MemberCache)
+MEMBER_CACHE_TTL = 600        # seconds a resolved author stays cached
+MEMBER_CACHE_MISS_TTL = 300   # seconds an author who left stays cached as missing
+MEMBER_CACHE_SIZE = 500       # authors kept per guild
+MEMBER_QUERY_TIMEOUT = 1.0    # seconds to wait for the gateway before rendering "User ID …"
+MEMBER_QUERY_BACKOFF = 30     # seconds to skip queries for a guild after one failed
+
+RENDER_CACHE_SIZE = 1024      # rendered memory/list embeds kept in memory
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+class MemberCache:
+    """
+    Per-guild TTL/LRU cache of whether memory authors are still in the guild.
+
+    Authors that are not in discord.py's member cache are fetched in one
+    batched gateway query per render, and users who left the guild are
+    remembered as missing so they are not queried again until the TTL ends.
+    The bot does not request the members intent, so joins and leaves are
+    only picked up once an entry expires.
+    Queries are capped at MEMBER_QUERY_TIMEOUT so a slow gateway never costs
+    an interaction its 3 second deadline; after a failure the guild is not
+    queried again for MEMBER_QUERY_BACKOFF seconds.
+    """
+
+    def __init__(self, bot: commands.Bot, ttl: float = MEMBER_CACHE_TTL,
+                 miss_ttl: float = MEMBER_CACHE_MISS_TTL, max_size: int = MEMBER_CACHE_SIZE):
+        self.bot = bot
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self.max_size = max_size
+        # guild_id -> {user_id: (expires_at, still in the guild)}
+        self._guilds: dict[int, OrderedDict[int, tuple[float, bool]]] = {}
+        # guild_id -> time until which queries are skipped
+        self._backoff: dict[int, float] = {}
+        # (guild_id, user_id) -> resolved once the query asking for it is done
+        self._pending: dict[tuple[int, int], asyncio.Future] = {}
+
+    def _entries(self, guild_id: int) -> OrderedDict[int, tuple[float, bool]]:
+        entries = self._guilds.get(guild_id)
+        if entries is None:
+            entries = self._guilds[guild_id] = OrderedDict()
+        return entries
+
+    def _lookup(self, guild: discord.Guild, user_id: int) -> bool | None:
+        """Return whether the author is in the guild, or None when it must be fetched."""
+        if guild.get_member(user_id) is not None:
+            return True
+
+        entries = self._guilds.get(guild.id)
+        if not entries or user_id not in entries:
+            return None
+
+        expires_at, found = entries[user_id]
+        if expires_at <= time.monotonic():
+            del entries[user_id]
+            return None
+
+        entries.move_to_end(user_id)
+        return found
+
+    def _store(self, guild_id: int, user_id: int, found: bool):
+        ttl = self.ttl if found else self.miss_ttl
+        entries = self._entries(guild_id)
+        entries[user_id] = (time.monotonic() + ttl, found)
+        entries.move_to_end(user_id)
+        while len(entries) > self.max_size:
+            entries.popitem(last=False)
+
+    def is_member(self, guild: discord.Guild, user_id: int) -> bool:
+        """True if the author is known to be in the guild; unknown counts as not."""
+        return bool(self._lookup(guild, user_id))
+
+    async def prefetch(self, guild: discord.Guild, user_ids):
+        """
+        Resolve every unknown author in one request (up to 100 per query).
+        Authors already being queried by another render are awaited instead
+        of queried again.
+        """
+        if self._backoff.get(guild.id, 0) > time.monotonic():
+            return
+        if self.bot.is_ws_ratelimited():
+            # A throttled send would outlast MEMBER_QUERY_TIMEOUT anyway
+            return
+
+        missing = []
+        in_flight = []
+        for user_id in dict.fromkeys(user_ids):
+            if user_id is None or self._lookup(guild, user_id) is not None:
+                continue
+            future = self._pending.get((guild.id, user_id))
+            if future is not None:
+                in_flight.append(future)
+            else:
+                missing.append(user_id)
+
+        loop = asyncio.get_running_loop()
+        for user_id in missing:
+            self._pending[(guild.id, user_id)] = loop.create_future()
+
+        try:
+            await self._query(guild, missing)
+        finally:
+            for user_id in missing:
+                future = self._pending.pop((guild.id, user_id))
+                if not future.done():
+                    future.set_result(None)
+
+        if in_flight:
+            # asyncio.wait, unlike gather, does not cancel the shared futures
+            # if this render is cancelled
+            await asyncio.wait(in_flight)
+
+    async def _query(self, guild: discord.Guild, user_ids: list[int]):
+        for start in range(0, len(user_ids), 100):
+            chunk = user_ids[start:start + 100]
+            try:
+                members = await asyncio.wait_for(
+                    guild.query_members(user_ids=chunk, limit=len(chunk), cache=False),
+                    timeout=MEMBER_QUERY_TIMEOUT,
+                )
+            except (asyncio.TimeoutError, RuntimeError, discord.ClientException, discord.HTTPException):
+                # Render with "User ID …" for now and give the gateway a rest
+                self._backoff[guild.id] = time.monotonic() + MEMBER_QUERY_BACKOFF
+                return
+
+            found = {m.id for m in members}
+            for user_id in chunk:
+                self._store(guild.id, user_id, user_id in found)
+
+
 class Memory(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         os.makedirs(DATA_DIR, exist_ok=True)
         self.memories = self._load_memories()
+        self._next_id = max((m["id"] for m in self.memories), default=0) + 1
+        self.members = MemberCache(bot)
+        # Owned by this cog instance: keys are memory and guild ids, which
+        # would be stale for a reloaded cog or another bot
+        self.renders = register(RenderCache("memory", max_size=RENDER_CACHE_SIZE))
+        # (guild_id, count) -> latest memories, kept out of self.renders so
+        # its counters only describe rendered embeds
+        self._pages: dict[tuple[int, int], list[dict]] = {}
+
+    def cog_unload(self):
+        self.renders.clear()
+        self._pages.clear()
+        unregister(self.renders)
 
     # ==========
     # JSON helpers
@@ -32,11 +179,18 @@ class Memory(commands.Cog):
         try:
             with open(MEMORY_FILE, "r", encoding="utf-8") as f:
                 data = json.load(f)
-            if isinstance(data, list):
-                return data
-            return []
         except Exception:
             return []
+        if not isinstance(data, list):
+            return []
+
+        # Older files have no ids; number them in file order
+        next_id = max((m.get("id", 0) for m in data), default=0) + 1
+        for mem in data:
+            if "id" not in mem:
+                mem["id"] = next_id
+                next_id += 1
+        return data
 
     def _save_memories(self):
         with open(MEMORY_FILE, "w", encoding="utf-8") as f:
@@ -44,20 +198,81 @@ class Memory(commands.Cog):
 
     def _add_memory(self, guild_id: int, author_id: int, text: str, message_link: str | None):
         entry = {
+            "id": self._next_id,
             "guild_id": guild_id,
             "author_id": author_id,
             "text": text,
             "message_link": message_link,
             "created_at": _now_iso(),
         }
+        self._next_id += 1
         self.memories.append(entry)
         self._save_memories()
+        self._invalidate_renders(entry)
         return entry
 
+    def _get_memory(self, guild_id: int, mem_id: int) -> dict | None:
+        for mem in self.memories:
+            if mem.get("id") == mem_id and mem.get("guild_id") == guild_id:
+                return mem
+        return None
+
+    def _edit_memory(self, guild_id: int, mem_id: int, text: str) -> dict | None:
+        mem = self._get_memory(guild_id, mem_id)
+        if mem is None:
+            return None
+        mem["text"] = text
+        self._save_memories()
+        self._invalidate_renders(mem)
+        return mem
+
+    def _delete_memory(self, guild_id: int, mem_id: int) -> dict | None:
+        mem = self._get_memory(guild_id, mem_id)
+        if mem is None:
+            return None
+        self.memories.remove(mem)
+        self._save_memories()
+        self._invalidate_renders(mem)
+        return mem
+
+    def _can_change(self, ctx: commands.Context, mem: dict) -> bool:
+        """Authors may change their own memories, moderators anyone's."""
+        if mem.get("author_id") == ctx.author.id:
+            return True
+        return ctx.channel.permissions_for(ctx.author).manage_messages
+
     def _get_guild_memories(self, guild_id: int):
         return [m for m in self.memories if m.get("guild_id") == guild_id]
 
-    def _build_memory_embed(self, mem: dict, guild: discord.Guild | None) -> discord.Embed:
+    # ==========
+    # Embed rendering (cached)
+    # ==========
+
+    def _invalidate_renders(self, mem: dict):
+        """Drop the cached embed of this memory and the list pages of its guild."""
+        guild_id = mem.get("guild_id")
+        self.renders.invalidate(("memory", mem.get("id")))
+        self.renders.invalidate_where(lambda key: key[0] == "list" and key[1] == guild_id)
+        for page_key in [k for k in self._pages if k[0] == guild_id]:
+            del self._pages[page_key]
+
+    def _author_name(self, guild: discord.Guild | None, author_id: int | None) -> str:
+        if guild and author_id is not None and self.members.is_member(guild, author_id):
+            return f"<@{author_id}>"
+        return f"User ID {author_id}"
+
+    async def _build_memory_embed(self, mem: dict, guild: discord.Guild | None) -> discord.Embed:
+        if guild:
+            await self.members.prefetch(guild, [mem.get("author_id")])
+        author_name = self._author_name(guild, mem.get("author_id"))
+
+        # Cached per memory; the author text is the version so a newly
+        # resolved author re-renders on its own
+        key = ("memory", mem.get("id"))
+        embed = self.renders.get(key, version=author_name)
+        if embed is not None:
+            return embed
+
         created_at = mem.get("created_at")
         try:
             dt = datetime.fromisoformat(created_at)
@@ -66,9 +281,6 @@ class Memory(commands.Cog):
         except Exception:
             when_text = created_at or "Unknown time"
 
-        author = guild.get_member(mem.get("author_id")) if guild else None
-        author_name = author.mention if author else f"User ID {mem.get('author_id')}"
-
         embed = discord.Embed(
             title="💖 Memory",
             description=mem.get("text", ""),
@@ -81,13 +293,17 @@ class Memory(commands.Cog):
         if link:
             embed.add_field(name="Original message", value=link, inline=False)
 
+        embed.set_footer(text=f"Memory #{mem.get('id')}")
+        self.renders.put(key, embed, version=author_name)
         return embed
 
-    def _build_list_embed(self, guild: discord.Guild, count: int = 5) -> discord.Embed | None:
-        guild_memories = self._get_guild_memories(guild.id)
-        if not guild_memories:
-            return None
+    def _get_latest_memories(self, guild_id: int, count: int) -> list[dict]:
+        page_key = (guild_id, count)
+        latest = self._pages.get(page_key)
+        if latest is not None:
+            return latest
 
+        guild_memories = self._get_guild_memories(guild_id)
         try:
             guild_memories.sort(
                 key=lambda m: datetime.fromisoformat(m.get("created_at", ""))  # type: ignore[arg-type]
@@ -95,15 +311,31 @@ class Memory(commands.Cog):
         except Exception:
             pass
 
-        count = max(1, min(count, 20))
         latest = guild_memories[-count:]
+        self._pages[page_key] = latest
+        return latest
+
+    async def _build_list_embed(self, guild: discord.Guild, count: int = 5) -> discord.Embed | None:
+        count = max(1, min(count, 20))
+        latest = self._get_latest_memories(guild.id, count)
+        if not latest:
+            return None
+
+        # Resolve every author on this page in one request
+        await self.members.prefetch(guild, [m.get("author_id") for m in latest])
+        author_names = tuple(self._author_name(guild, m.get("author_id")) for m in latest)
+
+        key = ("list", guild.id, count)
+        embed = self.renders.get(key, version=author_names)
+        if embed is not None:
+            return embed
 
         embed = discord.Embed(
             title=f"📜 Last {len(latest)} Memories",
             color=0xffd1e3,
         )
 
-        for mem in latest:
+        for mem, author_name in zip(latest, author_names):
             created_at = mem.get("created_at")
             try:
                 dt = datetime.fromisoformat(created_at)
@@ -112,9 +344,6 @@ class Memory(commands.Cog):
             except Exception:
                 when_short = created_at or "Unknown time"
 
-            author = guild.get_member(mem.get("author_id")) if guild else None
-            author_name = author.mention if author else f"User ID {mem.get('author_id')}"
-
             text = mem.get("text", "")
             link = mem.get("message_link")
             value_parts = [f"{text}", f"By: {author_name}", f"When: {when_short}"]
@@ -127,6 +356,7 @@ class Memory(commands.Cog):
                 inline=False,
             )
 
+        self.renders.put(key, embed, version=author_names)
         return embed
 
     # ==========
@@ -147,7 +377,7 @@ class Memory(commands.Cog):
             message_link=ctx.message.jump_url,
         )
 
-        embed = self._build_memory_embed(mem, ctx.guild)
+        embed = await self._build_memory_embed(mem, ctx.guild)
         await ctx.send("Memory saved. 💌", embed=embed)
 
     @commands.command(name="randommemory")
@@ -163,7 +393,7 @@ class Memory(commands.Cog):
             return
 
         mem = random.choice(guild_memories)
-        embed = self._build_memory_embed(mem, ctx.guild)
+        embed = await self._build_memory_embed(mem, ctx.guild)
         await ctx.send(embed=embed)
 
     @commands.command(name="listmemory")
@@ -173,13 +403,65 @@ class Memory(commands.Cog):
             await ctx.send("This command can only be used in a server.")
             return
 
-        embed = self._build_list_embed(ctx.guild, count=count)
+        embed = await self._build_list_embed(ctx.guild, count=count)
         if embed is None:
             await ctx.send("No memories saved yet. Use `!addmemory` or the panel to add one.")
             return
 
         await ctx.send(embed=embed)
 
+    @commands.command(name="editmemory")
+    async def edit_memory_cmd(self, ctx: commands.Context, mem_id: int, *, text: str):
+        """CLI version: edit the text of a memory by its #id."""
+        if not ctx.guild:
+            await ctx.send("This command can only be used in a server.")
+            return
+
+        mem = self._get_memory(ctx.guild.id, mem_id)
+        if mem is None:
+            await ctx.send(f"No memory #{mem_id} in this server.")
+            return
+        if not self._can_change(ctx, mem):
+            await ctx.send("You can only edit your own memories.")
+            return
+
+        mem = self._edit_memory(ctx.guild.id, mem_id, text)
+
+        embed = await self._build_memory_embed(mem, ctx.guild)
+        await ctx.send("Memory updated. ✏️", embed=embed)
+
+    @commands.command(name="deletememory")
+    async def delete_memory_cmd(self, ctx: commands.Context, mem_id: int):
+        """CLI version: delete a memory by its #id."""
+        if not ctx.guild:
+            await ctx.send("This command can only be used in a server.")
+            return
+
+        mem = self._get_memory(ctx.guild.id, mem_id)
+        if mem is None:
+            await ctx.send(f"No memory #{mem_id} in this server.")
+            return
+        if not self._can_change(ctx, mem):
+            await ctx.send("You can only delete your own memories.")
+            return
+
+        self._delete_memory(ctx.guild.id, mem_id)
+
+        await ctx.send(f"Memory #{mem_id} deleted. 🗑️")
+
+    @commands.command(name="renderstats")
+    @commands.is_owner()
+    async def render_stats_cmd(self, ctx: commands.Context):
+        """Show hit/miss counters of the embed render caches."""
+        lines = []
+        for cache in all_caches().values():
+            stats = cache.stats()
+            lines.append(
+                f"**{stats['name']}**: {stats['hits']} hits / {stats['misses']} misses "
+                f"({stats['hit_rate']:.0%}), {stats['size']} cached"
+            )
+        await ctx.send("\n".join(lines) or "No render caches yet.")
+
     # ==========
     # Panel + modal
     # ==========
@@ -246,7 +528,7 @@ class MemoryModal(discord.ui.Modal, title="Add a Memory"):
             pass
 
         # Show memory embed
-        embed = self.cog._build_memory_embed(mem, guild)
+        embed = await self.cog._build_memory_embed(mem, guild)
         await interaction.response.send_message("Memory saved. 💌", embed=embed)
 
         # Respawn a fresh panel at the bottom
@@ -309,7 +591,7 @@ class MemoryPanelView(discord.ui.View):
             await interaction.response.send_message("This only works in a server.", ephemeral=True)
             return
 
-        embed = self.cog._build_list_embed(guild, count=5)
+        embed = await self.cog._build_list_embed(guild, count=5)
         if embed is None:
             await interaction.response.send_message(
                 "No memories saved yet. Add one first.",
@@ -337,7 +619,7 @@ class MemoryPanelView(discord.ui.View):
             return
 
         mem = random.choice(guild_memories)
-        embed = self.cog._build_memory_embed(mem, guild)
+        embed = await self.cog._build_memory_embed(mem, guild)
 
         # Show random, then respawn panel
         await interaction.response.send_message(embed=embed)
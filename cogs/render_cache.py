@@ -0,0 +1,85 @@
+# cogs/render_cache.py
+#
+# Helper module shared by the cogs (not an extension, nothing to load).
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+class RenderCache:
+    """
+    Small LRU cache for rendered embeds (or anything else that is costly to rebuild).
+
+    Each entry is stored with a version; a lookup only hits when the caller's
+    version matches, so values that depend on changing inputs (e.g. whether an
+    author could be resolved) rebuild themselves without explicit invalidation.
+    """
+
+    def __init__(self, name: str, max_size: int = 512):
+        self.name = name
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple[Hashable, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, version: Hashable = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Hashable, value: Any, version: Hashable = None):
+        self._entries[key] = (version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]):
+        for key in [k for k in self._entries if predicate(k)]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# Caches are owned by whoever creates them (a cog or a module); this only
+# lists them for !renderstats and the benchmarks.
+_caches: Dict[str, RenderCache] = {}
+
+
+def register(cache: RenderCache) -> RenderCache:
+    """List the cache under its name, replacing any earlier one with that name."""
+    _caches[cache.name] = cache
+    return cache
+
+
+def unregister(cache: RenderCache):
+    if _caches.get(cache.name) is cache:
+        del _caches[cache.name]
+
+
+def all_caches() -> Dict[str, RenderCache]:
+    return dict(_caches)